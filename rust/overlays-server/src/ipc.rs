@@ -1,8 +1,6 @@
 #[cfg(not(windows))]
 compile_error!("The IPC module is Windows-only.");
 
-use std::ffi::OsStr;
-use std::os::windows::ffi::OsStrExt;
 use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
 use std::sync::mpsc;
 use std::sync::{Arc, Mutex};
@@ -10,115 +8,215 @@ use std::thread::{self, JoinHandle};
 use std::time::Duration;
 
 use windows::Win32::Foundation::{
-    CloseHandle, DUPLICATE_SAME_ACCESS, DuplicateHandle, ERROR_BROKEN_PIPE, ERROR_MORE_DATA,
-    ERROR_NO_DATA, ERROR_OPERATION_ABORTED, ERROR_PIPE_CONNECTED, ERROR_PIPE_LISTENING, HANDLE,
+    CloseHandle, ERROR_IO_PENDING, ERROR_MORE_DATA, ERROR_OPERATION_ABORTED, ERROR_PIPE_CONNECTED,
+    GetLastError, HANDLE, WAIT_EVENT, WAIT_OBJECT_0,
 };
 use windows::Win32::Storage::FileSystem::{
-    FlushFileBuffers, PIPE_ACCESS_DUPLEX, ReadFile, WriteFile,
+    FILE_FLAG_OVERLAPPED, PIPE_ACCESS_DUPLEX, ReadFile, WriteFile,
 };
-use windows::Win32::System::IO::CancelSynchronousIo;
+use windows::Win32::System::IO::{CancelIoEx, GetOverlappedResult, OVERLAPPED};
 use windows::Win32::System::Pipes::{
-    ConnectNamedPipe, CreateNamedPipeW, DisconnectNamedPipe, PIPE_NOWAIT, PIPE_READMODE_MESSAGE,
-    PIPE_TYPE_MESSAGE, PIPE_UNLIMITED_INSTANCES, PIPE_WAIT, SetNamedPipeHandleState,
+    ConnectNamedPipe, CreateNamedPipeW, DisconnectNamedPipe, PIPE_READMODE_MESSAGE,
+    PIPE_TYPE_MESSAGE, PIPE_UNLIMITED_INSTANCES, PIPE_WAIT,
+};
+use windows::Win32::System::Threading::{
+    CreateEventW, INFINITE, ResetEvent, SetEvent, WaitForMultipleObjects,
 };
-use windows::Win32::System::Threading::{GetCurrentProcess, GetCurrentThread};
 use windows::core::PCWSTR;
 
 use crate::config::Config;
 use crate::protocol::{COMMAND_TIMEOUT, OverlayResponse, PIPE_BUFFER_SIZE, parse_message};
 use crate::state::ActorMessage;
+use crate::wide::to_wide;
+
+const RETRY_INTERVAL: Duration = Duration::from_millis(250);
+const IDLE_INSTANCE_CAP: usize = 4;
 
-const POLL_INTERVAL: Duration = Duration::from_millis(50);
+type InstancePool = Arc<Mutex<Vec<PipeHandle>>>;
 
 pub struct ListenerRuntime {
     join_handle: Option<JoinHandle<()>>,
-    session_threads: Arc<Mutex<Vec<SessionThread>>>,
+    sessions: Arc<SessionRegistry>,
+    shutdown_event: Arc<ShutdownEvent>,
 }
 
-struct SessionThread {
-    join_handle: JoinHandle<()>,
-    cancel_handle: Option<ThreadHandle>,
+impl ListenerRuntime {
+    pub fn shutdown(&mut self) {
+        self.shutdown_event.signal();
+        if let Some(join_handle) = self.join_handle.take() {
+            let _ = join_handle.join();
+        }
+        self.sessions.join_all();
+    }
+
+    #[cfg(test)]
+    fn session_thread_count(&self) -> usize {
+        self.sessions.active_count()
+    }
 }
 
-struct ThreadHandle(HANDLE);
-
-unsafe impl Send for ThreadHandle {}
-
-impl ThreadHandle {
-    fn duplicate_current() -> Option<Self> {
-        let current_process = unsafe { GetCurrentProcess() };
-        let mut duplicated = HANDLE::default();
-        let duplicated_ok = unsafe {
-            DuplicateHandle(
-                current_process,
-                GetCurrentThread(),
-                current_process,
-                &mut duplicated,
-                0,
-                false,
-                DUPLICATE_SAME_ACCESS,
-            )
-        };
+/// Tracks session threads so the runtime can join them at shutdown. Sessions
+/// retire their own slot when they finish, so idle periods leave no dead
+/// threads behind for the listener to poll for.
+struct SessionRegistry {
+    active: Mutex<Vec<SessionSlot>>,
+    retired: Mutex<Vec<JoinHandle<()>>>,
+}
 
-        if duplicated_ok.is_ok() {
-            Some(Self(duplicated))
-        } else {
-            None
+struct SessionSlot {
+    id: u64,
+    join_handle: JoinHandle<()>,
+}
+
+impl SessionRegistry {
+    fn new() -> Self {
+        Self {
+            active: Mutex::new(Vec::new()),
+            retired: Mutex::new(Vec::new()),
         }
     }
 
-    fn cancel_sync_io(&self) {
-        let _ = unsafe { CancelSynchronousIo(self.0) };
+    fn register(&self, id: u64, join_handle: JoinHandle<()>) {
+        self.active
+            .lock()
+            .unwrap_or_else(|poison| poison.into_inner())
+            .push(SessionSlot { id, join_handle });
     }
-}
 
-impl Drop for ThreadHandle {
-    fn drop(&mut self) {
-        let _ = unsafe { CloseHandle(self.0) };
+    fn retire(&self, id: u64) {
+        let mut active = self
+            .active
+            .lock()
+            .unwrap_or_else(|poison| poison.into_inner());
+        let Some(index) = active.iter().position(|slot| slot.id == id) else {
+            return;
+        };
+        let slot = active.swap_remove(index);
+        drop(active);
+        self.retired
+            .lock()
+            .unwrap_or_else(|poison| poison.into_inner())
+            .push(slot.join_handle);
     }
-}
 
-impl ListenerRuntime {
-    pub fn shutdown(&mut self) {
-        cancel_all_sessions(&self.session_threads);
-        if let Some(join_handle) = self.join_handle.take() {
+    fn join_retired(&self) {
+        let retired = std::mem::take(
+            &mut *self
+                .retired
+                .lock()
+                .unwrap_or_else(|poison| poison.into_inner()),
+        );
+        for join_handle in retired {
             let _ = join_handle.join();
         }
-        cancel_all_sessions(&self.session_threads);
-        reap_finished_sessions(&self.session_threads);
-        join_all_sessions(&self.session_threads);
+    }
+
+    fn join_all(&self) {
+        loop {
+            let slot = self
+                .active
+                .lock()
+                .unwrap_or_else(|poison| poison.into_inner())
+                .pop();
+            match slot {
+                Some(slot) => {
+                    let _ = slot.join_handle.join();
+                }
+                None => break,
+            }
+        }
+        self.join_retired();
     }
 
     #[cfg(test)]
-    fn session_thread_count(&self) -> usize {
-        self.session_threads
+    fn active_count(&self) -> usize {
+        self.active
             .lock()
             .unwrap_or_else(|poison| poison.into_inner())
             .len()
     }
 }
 
+/// Manual-reset event signalled once at shutdown; every overlapped wait in
+/// the listener and its sessions includes it, so blocked I/O wakes promptly
+/// instead of waiting for the next client or message.
+struct ShutdownEvent(HANDLE);
+
+unsafe impl Send for ShutdownEvent {}
+unsafe impl Sync for ShutdownEvent {}
+
+impl ShutdownEvent {
+    fn create() -> Option<Self> {
+        unsafe { CreateEventW(None, true, false, None) }.ok().map(Self)
+    }
+
+    fn signal(&self) {
+        let _ = unsafe { SetEvent(self.0) };
+    }
+
+    fn raw(&self) -> HANDLE {
+        self.0
+    }
+}
+
+impl Drop for ShutdownEvent {
+    fn drop(&mut self) {
+        let _ = unsafe { CloseHandle(self.0) };
+    }
+}
+
+/// Manual-reset event reused across overlapped operations; callers reset it
+/// before each new operation instead of allocating a kernel object per call.
+struct EventHandle(HANDLE);
+
+impl EventHandle {
+    fn create() -> Option<Self> {
+        unsafe { CreateEventW(None, true, false, None) }.ok().map(Self)
+    }
+
+    fn raw(&self) -> HANDLE {
+        self.0
+    }
+
+    fn reset(&self) {
+        let _ = unsafe { ResetEvent(self.0) };
+    }
+}
+
+impl Drop for EventHandle {
+    fn drop(&mut self) {
+        let _ = unsafe { CloseHandle(self.0) };
+    }
+}
+
 pub fn spawn_listener(
     config: Config,
     actor_sender: mpsc::Sender<ActorMessage>,
     shutdown: Arc<AtomicBool>,
 ) -> ListenerRuntime {
-    let session_threads = Arc::new(Mutex::new(Vec::new()));
-    let thread_registry = session_threads.clone();
+    let sessions = Arc::new(SessionRegistry::new());
+    let shutdown_event =
+        Arc::new(ShutdownEvent::create().expect("failed to create shutdown event"));
     let next_session_id = Arc::new(AtomicU64::new(1));
+    let idle_instances: InstancePool = Arc::new(Mutex::new(Vec::new()));
+    let registry = sessions.clone();
+    let listener_event = shutdown_event.clone();
     let join_handle = thread::spawn(move || {
         listener_loop(
             config,
             actor_sender,
             shutdown,
-            thread_registry,
+            registry,
             next_session_id,
+            idle_instances,
+            listener_event,
         );
     });
 
     ListenerRuntime {
         join_handle: Some(join_handle),
-        session_threads,
+        sessions,
+        shutdown_event,
     }
 }
 
@@ -126,41 +224,64 @@ fn listener_loop(
     config: Config,
     actor_sender: mpsc::Sender<ActorMessage>,
     shutdown: Arc<AtomicBool>,
-    session_threads: Arc<Mutex<Vec<SessionThread>>>,
+    sessions: Arc<SessionRegistry>,
     next_session_id: Arc<AtomicU64>,
+    idle_instances: InstancePool,
+    shutdown_event: Arc<ShutdownEvent>,
 ) {
+    let Some(connect_event) = EventHandle::create() else {
+        return;
+    };
+
     while !shutdown.load(Ordering::SeqCst) {
-        reap_finished_sessions(&session_threads);
+        sessions.join_retired();
 
-        let Some(pipe_handle) = create_pipe_instance(&config.pipe_path) else {
-            thread::sleep(Duration::from_millis(250));
-            continue;
+        let recycled = idle_instances
+            .lock()
+            .unwrap_or_else(|poison| poison.into_inner())
+            .pop();
+        let pipe_handle = match recycled {
+            Some(handle) => handle,
+            None => match create_pipe_instance(&config.pipe_path) {
+                Some(handle) => handle,
+                None => {
+                    thread::sleep(RETRY_INTERVAL);
+                    continue;
+                }
+            },
         };
 
-        match wait_for_client(pipe_handle.raw(), &shutdown, &session_threads) {
+        match wait_for_client(pipe_handle.raw(), &connect_event, &shutdown, &shutdown_event) {
             ConnectResult::Connected => {
                 if shutdown.load(Ordering::SeqCst) {
                     continue;
                 }
 
-                let _session_id = next_session_id.fetch_add(1, Ordering::Relaxed);
+                let session_id = next_session_id.fetch_add(1, Ordering::Relaxed);
                 let actor_sender = actor_sender.clone();
                 let shutdown = shutdown.clone();
-                let (ready_tx, ready_rx) = mpsc::channel();
+                let session_event = shutdown_event.clone();
+                let idle_instances = idle_instances.clone();
+                let registry = sessions.clone();
+                let (start_tx, start_rx) = mpsc::channel::<()>();
                 let join_handle = thread::spawn(move || {
-                    let _ = ready_tx.send(ThreadHandle::duplicate_current());
-                    session_loop(pipe_handle, actor_sender, shutdown)
-                });
-                let cancel_handle = ready_rx.recv().ok().flatten();
-                let mut sessions = session_threads
-                    .lock()
-                    .unwrap_or_else(|poison| poison.into_inner());
-                sessions.push(SessionThread {
-                    join_handle,
-                    cancel_handle,
+                    // Wait until the listener has registered this session so
+                    // the retire below always finds its slot.
+                    let _ = start_rx.recv();
+                    session_loop(
+                        pipe_handle,
+                        actor_sender,
+                        shutdown,
+                        session_event,
+                        idle_instances,
+                    );
+                    registry.retire(session_id);
                 });
+                sessions.register(session_id, join_handle);
+                let _ = start_tx.send(());
             }
-            ConnectResult::Shutdown | ConnectResult::Failed => {}
+            ConnectResult::Shutdown => {}
+            ConnectResult::Failed => thread::sleep(RETRY_INTERVAL),
         }
     }
 }
@@ -169,22 +290,52 @@ fn session_loop(
     pipe_handle: PipeHandle,
     actor_sender: mpsc::Sender<ActorMessage>,
     shutdown: Arc<AtomicBool>,
+    shutdown_event: Arc<ShutdownEvent>,
+    idle_instances: InstancePool,
 ) {
-    if !set_blocking_read_mode(pipe_handle.raw()) {
+    let Some(io_event) = EventHandle::create() else {
         return;
-    }
+    };
+    let mut read_buffer = vec![0_u8; PIPE_BUFFER_SIZE];
+    let mut write_buffer = Vec::new();
 
     while !shutdown.load(Ordering::SeqCst) {
-        let message = match read_pipe_message(pipe_handle.raw()) {
+        let message = match read_pipe_message(
+            pipe_handle.raw(),
+            &io_event,
+            &shutdown_event,
+            &mut read_buffer,
+        ) {
             SessionRead::Message(message) => message,
             SessionRead::Disconnected | SessionRead::Shutdown => break,
         };
 
         let response = handle_message(&message, &actor_sender);
-        if !write_pipe_message(pipe_handle.raw(), &response) {
+        if !write_pipe_message(
+            pipe_handle.raw(),
+            &response,
+            &io_event,
+            &shutdown_event,
+            &mut write_buffer,
+        ) {
             break;
         }
     }
+
+    if !shutdown.load(Ordering::SeqCst) && recycle_pipe_instance(pipe_handle.raw()) {
+        let mut pool = idle_instances
+            .lock()
+            .unwrap_or_else(|poison| poison.into_inner());
+        if pool.len() < IDLE_INSTANCE_CAP {
+            pool.push(pipe_handle);
+        }
+    }
+}
+
+/// Detach the finished client so the same kernel pipe object can accept the
+/// next connection, instead of paying CreateNamedPipe per client.
+fn recycle_pipe_instance(handle: HANDLE) -> bool {
+    unsafe { DisconnectNamedPipe(handle) }.is_ok()
 }
 
 fn handle_message(message: &[u8], actor_sender: &mpsc::Sender<ActorMessage>) -> OverlayResponse {
@@ -193,18 +344,20 @@ fn handle_message(message: &[u8], actor_sender: &mpsc::Sender<ActorMessage>) ->
         Err(response) => return response,
     };
 
-    let (reply_tx, reply_rx) = mpsc::channel();
+    // One channel per command: a reply arriving after the timeout lands on a
+    // dropped receiver instead of being mistaken for the next command's.
+    let (reply_sender, reply_receiver) = mpsc::channel();
     if actor_sender
         .send(ActorMessage::Execute {
             command,
-            reply: reply_tx,
+            reply: reply_sender,
         })
         .is_err()
     {
         return OverlayResponse::internal_error("worker");
     }
 
-    match reply_rx.recv_timeout(COMMAND_TIMEOUT) {
+    match reply_receiver.recv_timeout(COMMAND_TIMEOUT) {
         Ok(response) => response,
         Err(_) => OverlayResponse::timeout(),
     }
@@ -215,8 +368,8 @@ fn create_pipe_instance(pipe_path: &str) -> Option<PipeHandle> {
     let handle = unsafe {
         CreateNamedPipeW(
             PCWSTR(wide_pipe_path.as_ptr()),
-            PIPE_ACCESS_DUPLEX,
-            PIPE_TYPE_MESSAGE | PIPE_READMODE_MESSAGE | PIPE_NOWAIT,
+            PIPE_ACCESS_DUPLEX | FILE_FLAG_OVERLAPPED,
+            PIPE_TYPE_MESSAGE | PIPE_READMODE_MESSAGE | PIPE_WAIT,
             PIPE_UNLIMITED_INSTANCES,
             PIPE_BUFFER_SIZE as u32,
             PIPE_BUFFER_SIZE as u32,
@@ -232,134 +385,181 @@ fn create_pipe_instance(pipe_path: &str) -> Option<PipeHandle> {
     }
 }
 
-fn set_blocking_read_mode(handle: HANDLE) -> bool {
-    let mode = PIPE_READMODE_MESSAGE | PIPE_WAIT;
-    unsafe { SetNamedPipeHandleState(handle, Some(&mode), None, None) }.is_ok()
-}
-
 fn wait_for_client(
     handle: HANDLE,
+    connect_event: &EventHandle,
     shutdown: &AtomicBool,
-    session_threads: &Mutex<Vec<SessionThread>>,
+    shutdown_event: &ShutdownEvent,
 ) -> ConnectResult {
-    while !shutdown.load(Ordering::SeqCst) {
-        reap_finished_sessions(session_threads);
-        match unsafe { ConnectNamedPipe(handle, None) } {
-            Ok(()) => return ConnectResult::Connected,
-            Err(_) => {
-                let error = unsafe { windows::Win32::Foundation::GetLastError() };
-                if error == ERROR_PIPE_CONNECTED || error == ERROR_NO_DATA {
-                    return ConnectResult::Connected;
-                }
-                if error == ERROR_PIPE_LISTENING {
-                    thread::sleep(POLL_INTERVAL);
-                    continue;
-                }
-                return ConnectResult::Failed;
+    if shutdown.load(Ordering::SeqCst) {
+        return ConnectResult::Shutdown;
+    }
+
+    connect_event.reset();
+    let mut overlapped = OVERLAPPED {
+        hEvent: connect_event.raw(),
+        ..OVERLAPPED::default()
+    };
+
+    if unsafe { ConnectNamedPipe(handle, Some(&mut overlapped)) }.is_ok() {
+        return ConnectResult::Connected;
+    }
+
+    let error = unsafe { GetLastError() };
+    if error == ERROR_PIPE_CONNECTED {
+        return ConnectResult::Connected;
+    }
+    if error != ERROR_IO_PENDING {
+        return ConnectResult::Failed;
+    }
+
+    match wait_for_completion(connect_event.raw(), shutdown_event) {
+        WaitOutcome::Completed => {
+            let mut transferred = 0_u32;
+            if unsafe { GetOverlappedResult(handle, &overlapped, &mut transferred, false) }.is_ok()
+            {
+                ConnectResult::Connected
+            } else {
+                ConnectResult::Failed
             }
         }
+        WaitOutcome::Shutdown => {
+            cancel_overlapped(handle, &overlapped);
+            let _ = unsafe { DisconnectNamedPipe(handle) };
+            ConnectResult::Shutdown
+        }
+        WaitOutcome::Failed => {
+            cancel_overlapped(handle, &overlapped);
+            ConnectResult::Failed
+        }
+    }
+}
+
+fn wait_for_completion(operation_event: HANDLE, shutdown_event: &ShutdownEvent) -> WaitOutcome {
+    let handles = [operation_event, shutdown_event.raw()];
+    let wait = unsafe { WaitForMultipleObjects(&handles, false, INFINITE) };
+    if wait == WAIT_OBJECT_0 {
+        WaitOutcome::Completed
+    } else if wait == WAIT_EVENT(WAIT_OBJECT_0.0 + 1) {
+        WaitOutcome::Shutdown
+    } else {
+        WaitOutcome::Failed
     }
-    let _ = unsafe { DisconnectNamedPipe(handle) };
-    ConnectResult::Shutdown
 }
 
-fn read_pipe_message(handle: HANDLE) -> SessionRead {
+/// Cancel a pending overlapped operation and wait for the kernel to release
+/// the OVERLAPPED block before the caller frees it.
+fn cancel_overlapped(handle: HANDLE, overlapped: &OVERLAPPED) {
+    let _ = unsafe { CancelIoEx(handle, Some(overlapped)) };
+    let mut transferred = 0_u32;
+    let _ = unsafe { GetOverlappedResult(handle, overlapped, &mut transferred, true) };
+}
+
+fn read_pipe_message(
+    handle: HANDLE,
+    io_event: &EventHandle,
+    shutdown_event: &ShutdownEvent,
+    buffer: &mut [u8],
+) -> SessionRead {
     let mut message = Vec::new();
-    let mut buffer = vec![0_u8; PIPE_BUFFER_SIZE];
 
     loop {
-        let mut bytes_read = 0_u32;
-        let read_result = unsafe {
-            ReadFile(
-                handle,
-                Some(buffer.as_mut_slice()),
-                Some(&mut bytes_read),
-                None,
-            )
+        io_event.reset();
+        let mut overlapped = OVERLAPPED {
+            hEvent: io_event.raw(),
+            ..OVERLAPPED::default()
         };
 
-        if let Err(_) = read_result {
-            let error = unsafe { windows::Win32::Foundation::GetLastError() };
-            if error == ERROR_MORE_DATA {
-                message.extend_from_slice(&buffer[..bytes_read as usize]);
-                continue;
-            }
-            if error == ERROR_OPERATION_ABORTED {
-                return SessionRead::Shutdown;
-            }
-            if error == ERROR_BROKEN_PIPE || error == ERROR_NO_DATA {
+        let started =
+            unsafe { ReadFile(handle, Some(&mut *buffer), None, Some(&mut overlapped)) };
+        if started.is_err() {
+            let error = unsafe { GetLastError() };
+            if error == ERROR_IO_PENDING {
+                match wait_for_completion(io_event.raw(), shutdown_event) {
+                    WaitOutcome::Completed => {}
+                    WaitOutcome::Shutdown => {
+                        cancel_overlapped(handle, &overlapped);
+                        return SessionRead::Shutdown;
+                    }
+                    WaitOutcome::Failed => {
+                        cancel_overlapped(handle, &overlapped);
+                        return SessionRead::Disconnected;
+                    }
+                }
+            } else if error != ERROR_MORE_DATA {
                 return SessionRead::Disconnected;
             }
-            return SessionRead::Disconnected;
         }
 
-        if bytes_read == 0 {
-            return SessionRead::Disconnected;
+        let mut bytes_read = 0_u32;
+        match unsafe { GetOverlappedResult(handle, &overlapped, &mut bytes_read, false) } {
+            Ok(()) => {
+                if bytes_read == 0 && message.is_empty() {
+                    return SessionRead::Disconnected;
+                }
+                message.extend_from_slice(&buffer[..bytes_read as usize]);
+                return SessionRead::Message(message);
+            }
+            Err(_) => {
+                let error = unsafe { GetLastError() };
+                if error == ERROR_MORE_DATA {
+                    message.extend_from_slice(&buffer[..bytes_read as usize]);
+                    continue;
+                }
+                if error == ERROR_OPERATION_ABORTED {
+                    return SessionRead::Shutdown;
+                }
+                // ERROR_BROKEN_PIPE and anything else unexpected both mean
+                // the client is gone.
+                return SessionRead::Disconnected;
+            }
         }
-
-        message.extend_from_slice(&buffer[..bytes_read as usize]);
-        return SessionRead::Message(message);
     }
 }
 
-fn write_pipe_message(handle: HANDLE, response: &OverlayResponse) -> bool {
-    let payload = match serde_json::to_vec(response) {
-        Ok(payload) => payload,
-        Err(_) => return false,
+fn write_pipe_message(
+    handle: HANDLE,
+    response: &OverlayResponse,
+    io_event: &EventHandle,
+    shutdown_event: &ShutdownEvent,
+    payload: &mut Vec<u8>,
+) -> bool {
+    payload.clear();
+    if serde_json::to_writer(&mut *payload, response).is_err() {
+        return false;
+    }
+    io_event.reset();
+    let mut overlapped = OVERLAPPED {
+        hEvent: io_event.raw(),
+        ..OVERLAPPED::default()
     };
-    let mut bytes_written = 0_u32;
-    if unsafe {
+
+    let started = unsafe {
         WriteFile(
             handle,
             Some(payload.as_slice()),
-            Some(&mut bytes_written),
             None,
+            Some(&mut overlapped),
         )
-    }
-    .is_err()
-    {
-        return false;
-    }
-    let _ = unsafe { FlushFileBuffers(handle) };
-    true
-}
-
-fn cancel_all_sessions(session_threads: &Mutex<Vec<SessionThread>>) {
-    let sessions = session_threads
-        .lock()
-        .unwrap_or_else(|poison| poison.into_inner());
-    for session in sessions.iter() {
-        if let Some(handle) = &session.cancel_handle {
-            handle.cancel_sync_io();
+    };
+    if started.is_err() {
+        if unsafe { GetLastError() } != ERROR_IO_PENDING {
+            return false;
         }
-    }
-}
-
-fn reap_finished_sessions(session_threads: &Mutex<Vec<SessionThread>>) {
-    let mut sessions = session_threads
-        .lock()
-        .unwrap_or_else(|poison| poison.into_inner());
-    let mut pending = Vec::with_capacity(sessions.len());
-
-    while let Some(session) = sessions.pop() {
-        if session.join_handle.is_finished() {
-            let _ = session.join_handle.join();
-        } else {
-            pending.push(session);
+        match wait_for_completion(io_event.raw(), shutdown_event) {
+            WaitOutcome::Completed => {}
+            WaitOutcome::Shutdown | WaitOutcome::Failed => {
+                cancel_overlapped(handle, &overlapped);
+                return false;
+            }
         }
     }
 
-    pending.reverse();
-    *sessions = pending;
-}
-
-fn join_all_sessions(session_threads: &Mutex<Vec<SessionThread>>) {
-    let mut sessions = session_threads
-        .lock()
-        .unwrap_or_else(|poison| poison.into_inner());
-    while let Some(session) = sessions.pop() {
-        let _ = session.join_handle.join();
+    let mut bytes_written = 0_u32;
+    if unsafe { GetOverlappedResult(handle, &overlapped, &mut bytes_written, false) }.is_err() {
+        return false;
     }
+    bytes_written as usize == payload.len()
 }
 
 enum ConnectResult {
@@ -368,6 +568,12 @@ enum ConnectResult {
     Failed,
 }
 
+enum WaitOutcome {
+    Completed,
+    Shutdown,
+    Failed,
+}
+
 enum SessionRead {
     Message(Vec<u8>),
     Disconnected,
@@ -397,13 +603,6 @@ impl Drop for PipeHandle {
     }
 }
 
-fn to_wide(value: &str) -> Vec<u16> {
-    OsStr::new(value)
-        .encode_wide()
-        .chain(std::iter::once(0))
-        .collect()
-}
-
 #[cfg(test)]
 mod tests {
     use std::sync::atomic::{AtomicBool, Ordering};
@@ -7,6 +7,7 @@ pub mod render;
 pub mod server;
 pub mod state;
 pub mod ui;
+mod wide;
 
 pub use config::Config;
 pub use protocol::{OverlayResponse, ParsedCommand};
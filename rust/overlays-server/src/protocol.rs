@@ -1,9 +1,13 @@
 use std::time::Duration;
 
+use qrcode::{Color, EcLevel, QrCode};
 use serde::Serialize;
 use serde_json::Value;
 
-pub const PIPE_BUFFER_SIZE: usize = 65_536;
+/// Kernel buffer per pipe direction and the per-session read buffer. Commands
+/// and replies are small JSON documents, so 4 KiB covers the common case in
+/// one transfer; larger messages arrive in chunks via ERROR_MORE_DATA.
+pub const PIPE_BUFFER_SIZE: usize = 4_096;
 pub const COMMAND_TIMEOUT: Duration = Duration::from_secs(10);
 
 #[derive(Debug, Clone, PartialEq, Eq)]
@@ -37,7 +41,7 @@ pub enum ParsedCommand {
         message_text: String,
     },
     CreateQrCodeWindow {
-        data: Value,
+        qr: PreparedQr,
         duration_seconds: f64,
         caption: String,
     },
@@ -72,6 +76,17 @@ impl ParsedCommand {
     }
 }
 
+/// A QR payload already encoded and packed into 1-bpp DIB rows. Encoding runs
+/// at parse time on the connection's own thread, so a large payload never
+/// stalls the shared state actor behind Reed-Solomon math.
+#[derive(Debug, Clone, PartialEq, Eq)]
+pub struct PreparedQr {
+    /// Number of modules along one edge of the QR matrix.
+    pub modules: i32,
+    /// Top-down 1-bpp DIB rows (DWORD-aligned), bit set for dark modules.
+    pub dib_bits: Vec<u8>,
+}
+
 #[derive(Debug, Clone, PartialEq, Eq, Serialize)]
 pub struct OverlayResponse {
     pub status: String,
@@ -136,13 +151,14 @@ impl OverlayResponse {
 pub fn parse_message(message: &[u8]) -> Result<ParsedCommand, OverlayResponse> {
     let root: Value =
         serde_json::from_slice(message).map_err(|_| OverlayResponse::invalid_json())?;
-    let command_value = root.get("command").cloned().unwrap_or(Value::Null);
-    let args = root
-        .get("args")
-        .cloned()
-        .unwrap_or_else(|| Value::Object(Default::default()));
-
-    let command_name = display_json_value(&command_value, false);
+    // Borrow straight out of the parsed document; cloning `args` here would
+    // deep-copy every command payload (QR data included) before dispatch.
+    let null_value = Value::Null;
+    let empty_args = Value::Object(Default::default());
+    let command_value = root.get("command").unwrap_or(&null_value);
+    let args = root.get("args").unwrap_or(&empty_args);
+
+    let command_name = display_json_value(command_value, false);
     let Some(command) = command_value.as_str() else {
         return Err(OverlayResponse::error(format!(
             "Unknown command {command_name}"
@@ -151,46 +167,49 @@ pub fn parse_message(message: &[u8]) -> Result<ParsedCommand, OverlayResponse> {
 
     match command {
         "create_highlight" => Ok(ParsedCommand::CreateHighlight {
-            rect: parse_rect_arg(&args, "rect"),
+            rect: parse_rect_arg(args, "rect"),
             timeout_seconds: get_duration_or_default(
-                &args,
+                args,
                 "timeout_seconds",
                 3.0,
                 "timeout_seconds",
             )?,
         }),
         "create_countdown" => Ok(ParsedCommand::CreateCountdown {
-            message_text: get_string_or_default(&args, "message_text", ""),
+            message_text: get_string_or_default(args, "message_text", ""),
             countdown_seconds: get_duration_or_default(
-                &args,
+                args,
                 "countdown_seconds",
                 3.0,
                 "countdown_seconds",
             )?,
         }),
         "create_elapsed_time" => Ok(ParsedCommand::CreateElapsedTime {
-            message_text: get_string_or_default(&args, "message_text", ""),
-        }),
-        "create_qrcode_window" => Ok(ParsedCommand::CreateQrCodeWindow {
-            data: get_value_or_default(&args, "data", Value::String(String::new())),
-            duration_seconds: get_duration_or_default(&args, "duration", 5.0, "duration")?,
-            caption: get_string_or_default(&args, "caption", ""),
+            message_text: get_string_or_default(args, "message_text", ""),
         }),
+        "create_qrcode_window" => {
+            let duration_seconds = get_duration_or_default(args, "duration", 5.0, "duration")?;
+            Ok(ParsedCommand::CreateQrCodeWindow {
+                qr: prepare_qr(get_arg(args, "data"))?,
+                duration_seconds,
+                caption: get_string_or_default(args, "caption", ""),
+            })
+        }
         "close_window" => Ok(ParsedCommand::CloseWindow {
-            window_id: parse_window_id_arg(&args, "window_id"),
+            window_id: parse_window_id_arg(args, "window_id"),
         }),
         "update_window_message" => Ok(ParsedCommand::UpdateWindowMessage {
-            window_id: parse_window_id_arg(&args, "window_id"),
-            new_message: parse_non_empty_message(&args, "new_message"),
+            window_id: parse_window_id_arg(args, "window_id"),
+            new_message: parse_non_empty_message(args, "new_message"),
         }),
         "take_break" => Ok(ParsedCommand::TakeBreak {
             duration_seconds: get_duration_or_default(
-                &args,
+                args,
                 "duration_seconds",
                 0.0,
                 "duration_seconds",
             )?,
-            duration_display: get_duration_display_or_default(&args, "duration_seconds", "0")?,
+            duration_display: get_duration_display_or_default(args, "duration_seconds", "0")?,
         }),
         "cancel_break" => Ok(ParsedCommand::CancelBreak),
         "close_all" => Ok(ParsedCommand::CloseAll),
@@ -204,10 +223,6 @@ fn get_arg<'a>(args: &'a Value, key: &str) -> Option<&'a Value> {
     args.as_object().and_then(|map| map.get(key))
 }
 
-fn get_value_or_default(args: &Value, key: &str, default: Value) -> Value {
-    get_arg(args, key).cloned().unwrap_or(default)
-}
-
 fn get_string_or_default(args: &Value, key: &str, default: &str) -> String {
     match get_arg(args, key) {
         Some(Value::String(value)) => value.clone(),
@@ -326,9 +341,46 @@ pub(crate) fn validate_duration_seconds(
     }
 }
 
+fn prepare_qr(data: Option<&Value>) -> Result<PreparedQr, OverlayResponse> {
+    let encoded = data.map(qr_payload_text).unwrap_or_default();
+    let qrcode = QrCode::with_error_correction_level(encoded.as_bytes(), EcLevel::M)
+        .map_err(|_| OverlayResponse::internal_error("create_qrcode_window"))?;
+    let width = qrcode.width();
+    Ok(PreparedQr {
+        modules: i32::try_from(width).unwrap_or(0),
+        dib_bits: pack_qr_dib_bits(width, &qrcode.to_colors()),
+    })
+}
+
+fn qr_payload_text(data: &Value) -> String {
+    match data {
+        Value::String(text) => text.clone(),
+        Value::Object(_) => serde_json::to_string(data).unwrap_or_default(),
+        other => other.to_string(),
+    }
+}
+
+/// Packs the QR matrix into top-down 1-bpp DIB rows so painting can blit the
+/// whole code in a single StretchDIBits call instead of drawing per module.
+fn pack_qr_dib_bits(width: usize, colors: &[Color]) -> Vec<u8> {
+    let stride = width.div_ceil(32) * 4;
+    let mut bits = vec![0_u8; stride * width];
+    for (row_index, row) in colors.chunks(width).enumerate() {
+        let row_offset = row_index * stride;
+        for (column_index, color) in row.iter().enumerate() {
+            if matches!(color, Color::Dark) {
+                bits[row_offset + (column_index / 8)] |= 0x80 >> (column_index % 8);
+            }
+        }
+    }
+    bits
+}
+
 #[cfg(test)]
 mod tests {
-    use super::{OverlayResponse, ParsedCommand, WindowIdArg, parse_message};
+    use qrcode::Color;
+
+    use super::{OverlayResponse, ParsedCommand, WindowIdArg, pack_qr_dib_bits, parse_message};
 
     #[test]
     fn parses_create_countdown_defaults() {
@@ -412,4 +464,33 @@ mod tests {
         let command = parse_message(br#"{"command":"close_all","args":{}}"#).unwrap();
         assert_eq!(command, ParsedCommand::CloseAll);
     }
+
+    #[test]
+    fn qr_dib_rows_pack_msb_first_with_dword_stride() {
+        use Color::{Dark, Light};
+
+        #[rustfmt::skip]
+        let bits = pack_qr_dib_bits(3, &[
+            Dark, Light, Dark,
+            Light, Dark, Light,
+            Dark, Dark, Dark,
+        ]);
+        // A 3-module row still occupies one DWORD-aligned 4-byte stride, with
+        // the leftmost module in the high bit of the first byte.
+        assert_eq!(bits.len(), 4 * 3);
+        assert_eq!(&bits[0..4], &[0b1010_0000, 0, 0, 0]);
+        assert_eq!(&bits[4..8], &[0b0100_0000, 0, 0, 0]);
+        assert_eq!(&bits[8..12], &[0b1110_0000, 0, 0, 0]);
+    }
+
+    #[test]
+    fn qr_dib_stride_grows_per_32_modules() {
+        let mut colors = vec![Color::Light; 33 * 33];
+        // Last module of the first row: past the first DWORD of the stride.
+        colors[32] = Color::Dark;
+        let bits = pack_qr_dib_bits(33, &colors);
+        assert_eq!(bits.len(), 8 * 33);
+        assert_eq!(bits[4], 0b1000_0000);
+        assert_eq!(bits.iter().filter(|byte| **byte != 0).count(), 1);
+    }
 }
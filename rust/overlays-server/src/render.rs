@@ -33,17 +33,17 @@ pub fn get_qrcode_position(
     (left, top, right, bottom)
 }
 
-pub fn countdown_lines(countdown: &CountdownSnapshot) -> Vec<String> {
-    let mut lines = vec![countdown.message.clone()];
+/// Formats only the dynamic second line; the static message line is drawn
+/// straight from the snapshot so painting does not re-clone it every frame.
+pub fn countdown_tail(countdown: &CountdownSnapshot) -> String {
     match countdown.visual {
         CountdownVisualState::Countdown { remaining } => {
-            lines.push(format!("Closing in {remaining} s"));
+            format!("Closing in {remaining} s")
         }
         CountdownVisualState::Elapsed { elapsed } => {
-            lines.push(format!("Elapsed time: {elapsed} seconds"));
+            format!("Elapsed time: {elapsed} seconds")
         }
     }
-    lines
 }
 
 pub fn countdown_box_rect(
@@ -115,7 +115,7 @@ pub fn qrcode_caption_rect(
 #[cfg(test)]
 mod tests {
     use super::{
-        BOX_H, BOX_W, GAP, TOP, TextSize, countdown_box_rect, countdown_lines,
+        BOX_H, BOX_W, GAP, TOP, TextSize, countdown_box_rect, countdown_tail,
         get_countdown_position, get_qrcode_position, qrcode_background_rect,
     };
     use crate::state::{CountdownSnapshot, CountdownVisualState};
@@ -162,17 +162,20 @@ mod tests {
     }
 
     #[test]
-    fn countdown_lines_match_visual_state() {
+    fn countdown_tail_matches_visual_state() {
         let countdown = CountdownSnapshot {
             id: 1,
             message: "Wait".to_string(),
             order: 1,
             visual: CountdownVisualState::Countdown { remaining: 5 },
         };
-        assert_eq!(
-            countdown_lines(&countdown),
-            vec!["Wait".to_string(), "Closing in 5 s".to_string()]
-        );
+        assert_eq!(countdown_tail(&countdown), "Closing in 5 s");
+
+        let elapsed = CountdownSnapshot {
+            visual: CountdownVisualState::Elapsed { elapsed: 7 },
+            ..countdown
+        };
+        assert_eq!(countdown_tail(&elapsed), "Elapsed time: 7 seconds");
     }
 
     #[test]
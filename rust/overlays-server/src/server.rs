@@ -1,7 +1,6 @@
 use std::sync::Arc;
 use std::sync::atomic::{AtomicBool, Ordering};
-use std::thread;
-use std::time::Duration;
+use std::sync::mpsc;
 
 use crate::config::Config;
 use crate::ipc::ListenerRuntime;
@@ -83,16 +82,15 @@ pub fn run_console() -> Result<(), String> {
     println!("Application ready - overlay windows can now be created");
     println!("Press Ctrl+C to shutdown gracefully");
 
-    let shutdown = Arc::new(AtomicBool::new(false));
-    let signal = shutdown.clone();
+    // Block until Ctrl+C instead of polling a flag; the handler wakes this
+    // thread immediately through the channel.
+    let (shutdown_tx, shutdown_rx) = mpsc::channel::<()>();
     ctrlc::set_handler(move || {
-        signal.store(true, Ordering::SeqCst);
+        let _ = shutdown_tx.send(());
     })
     .map_err(|err| err.to_string())?;
 
-    while !shutdown.load(Ordering::SeqCst) {
-        thread::sleep(Duration::from_millis(200));
-    }
+    let _ = shutdown_rx.recv();
 
     server.shutdown();
     Ok(())
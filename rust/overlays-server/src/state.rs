@@ -3,15 +3,11 @@ use std::sync::mpsc::{Receiver, RecvTimeoutError, Sender};
 use std::thread::{self, JoinHandle};
 use std::time::{Duration, Instant};
 
-use qrcode::{Color, EcLevel, QrCode};
 use rand::Rng;
-use serde_json::Value;
 
-use crate::protocol::{OverlayResponse, ParsedCommand, validate_duration_seconds};
+use crate::protocol::{OverlayResponse, ParsedCommand, PreparedQr, validate_duration_seconds};
 use crate::ui::UiBridge;
 
-const TICK_INTERVAL: Duration = Duration::from_millis(100);
-
 #[derive(Debug, Clone, PartialEq, Eq)]
 pub struct HighlightSnapshot {
     pub id: u32,
@@ -36,9 +32,11 @@ pub struct CountdownSnapshot {
 #[derive(Debug, Clone, PartialEq, Eq)]
 pub struct QrCodeSnapshot {
     pub id: u32,
-    pub matrix: Vec<Vec<bool>>,
+    /// Number of modules along one edge of the QR matrix.
+    pub modules: i32,
+    /// Top-down 1-bpp DIB rows (DWORD-aligned), bit set for dark modules.
+    pub dib_bits: Vec<u8>,
     pub qr_size: i32,
-    pub pix_per_mod: i32,
     pub padding: i32,
     pub caption: String,
     pub order: u64,
@@ -86,7 +84,6 @@ impl StateActor {
 
 #[derive(Debug, Clone)]
 struct HighlightEntry {
-    id: u32,
     coords: (i32, i32, i32, i32),
     color: (u8, u8, u8),
     expires_at: Instant,
@@ -107,9 +104,9 @@ struct CountdownEntry {
 
 #[derive(Debug, Clone)]
 struct QrCodeEntry {
-    matrix: Vec<Vec<bool>>,
+    modules: i32,
+    dib_bits: Vec<u8>,
     qr_size: i32,
-    pix_per_mod: i32,
     padding: i32,
     caption: String,
     order: u64,
@@ -118,7 +115,7 @@ struct QrCodeEntry {
 
 #[derive(Debug)]
 pub struct OverlayState {
-    rectangles: Vec<HighlightEntry>,
+    rectangles: HashMap<u32, HighlightEntry>,
     countdowns: HashMap<u32, CountdownEntry>,
     qrcodes: HashMap<u32, QrCodeEntry>,
     next_rect_id: u32,
@@ -132,7 +129,7 @@ pub struct OverlayState {
 impl Default for OverlayState {
     fn default() -> Self {
         Self {
-            rectangles: Vec::new(),
+            rectangles: HashMap::new(),
             countdowns: HashMap::new(),
             qrcodes: HashMap::new(),
             next_rect_id: 1,
@@ -212,14 +209,14 @@ impl OverlayState {
                 (OverlayResponse::success_window(window_id), true)
             }
             ParsedCommand::CreateQrCodeWindow {
-                data,
+                qr,
                 duration_seconds,
                 caption,
             } => match duration_from_seconds(duration_seconds, "duration") {
-                Ok(duration) => match self.add_qrcode_window(&data, duration, caption, now) {
-                    Ok(window_id) => (OverlayResponse::success_window(window_id), true),
-                    Err(response) => (response, false),
-                },
+                Ok(duration) => {
+                    let window_id = self.add_qrcode_window(qr, duration, caption, now);
+                    (OverlayResponse::success_window(window_id), true)
+                }
                 Err(response) => (response, false),
             },
             ParsedCommand::CloseWindow { window_id } => {
@@ -256,10 +253,10 @@ impl OverlayState {
                     );
                 }
                 if let Some(id) = window_id.numeric {
-                    if self.update_window(id, new_message) {
+                    if let Some(changed) = self.update_window(id, new_message) {
                         return (
                             OverlayResponse::success_message(format!("Window {id} updated")),
-                            true,
+                            changed,
                         );
                     }
                 }
@@ -275,7 +272,7 @@ impl OverlayState {
         let mut changed = false;
 
         let before_rectangles = self.rectangles.len();
-        self.rectangles.retain(|entry| entry.expires_at > now);
+        self.rectangles.retain(|_, entry| entry.expires_at > now);
         changed |= before_rectangles != self.rectangles.len();
 
         let before_qrcodes = self.qrcodes.len();
@@ -343,9 +340,9 @@ impl OverlayState {
             .iter()
             .map(|(id, entry)| QrCodeSnapshot {
                 id: *id,
-                matrix: entry.matrix.clone(),
+                modules: entry.modules,
+                dib_bits: entry.dib_bits.clone(),
                 qr_size: entry.qr_size,
-                pix_per_mod: entry.pix_per_mod,
                 padding: entry.padding,
                 caption: entry.caption.clone(),
                 order: entry.order,
@@ -353,16 +350,19 @@ impl OverlayState {
             .collect();
         qrcodes.sort_by_key(|entry| entry.order);
 
+        let mut rectangles: Vec<_> = self
+            .rectangles
+            .iter()
+            .map(|(id, entry)| HighlightSnapshot {
+                id: *id,
+                coords: entry.coords,
+                color: entry.color,
+            })
+            .collect();
+        rectangles.sort_by_key(|entry| entry.id);
+
         OverlaySnapshot {
-            rectangles: self
-                .rectangles
-                .iter()
-                .map(|entry| HighlightSnapshot {
-                    id: entry.id,
-                    coords: entry.coords,
-                    color: entry.color,
-                })
-                .collect(),
+            rectangles,
             countdowns,
             qrcodes,
         }
@@ -382,12 +382,14 @@ impl OverlayState {
             rng.random_range(64..=255),
             rng.random_range(64..=255),
         );
-        self.rectangles.push(HighlightEntry {
+        self.rectangles.insert(
             id,
-            coords: rect,
-            color,
-            expires_at: now + timeout,
-        });
+            HighlightEntry {
+                coords: rect,
+                color,
+                expires_at: now + timeout,
+            },
+        );
         id
     }
 
@@ -433,45 +435,32 @@ impl OverlayState {
         id
     }
 
+    /// The payload arrives already encoded ([`PreparedQr`]); the actor only
+    /// records it, so bursts of QR requests never serialize behind encoding.
     fn add_qrcode_window(
         &mut self,
-        data: &Value,
+        qr: PreparedQr,
         duration: Duration,
         caption: String,
         now: Instant,
-    ) -> Result<u32, OverlayResponse> {
-        let encoded = qr_payload_text(data);
-        let qrcode = QrCode::with_error_correction_level(encoded.as_bytes(), EcLevel::M)
-            .map_err(|_| OverlayResponse::internal_error("create_qrcode_window"))?;
-        let width = qrcode.width();
-        let colors = qrcode.to_colors();
-        let mut matrix = Vec::with_capacity(width);
-        for row in colors.chunks(width) {
-            matrix.push(
-                row.iter()
-                    .map(|color| matches!(color, Color::Dark))
-                    .collect::<Vec<bool>>(),
-            );
-        }
-
+    ) -> u32 {
         let id = self.next_qrcode_id;
         self.next_qrcode_id += 1;
         self.qrcode_order += 1;
         let pix_per_mod = 6_i32;
-        let qr_size = i32::try_from(width).unwrap_or(0) * pix_per_mod;
         self.qrcodes.insert(
             id,
             QrCodeEntry {
-                matrix,
-                qr_size,
-                pix_per_mod,
+                modules: qr.modules,
+                dib_bits: qr.dib_bits,
+                qr_size: qr.modules * pix_per_mod,
                 padding: 10,
                 caption,
                 order: self.qrcode_order,
                 expires_at: now + duration,
             },
         );
-        Ok(id)
+        id
     }
 
     fn close_window(&mut self, window_id: u32) -> bool {
@@ -481,17 +470,50 @@ impl OverlayState {
         if self.qrcodes.remove(&window_id).is_some() {
             return true;
         }
-        let previous_len = self.rectangles.len();
-        self.rectangles.retain(|entry| entry.id != window_id);
-        previous_len != self.rectangles.len()
+        self.rectangles.remove(&window_id).is_some()
     }
 
-    fn update_window(&mut self, window_id: u32, new_message: String) -> bool {
-        let Some(countdown) = self.countdowns.get_mut(&window_id) else {
-            return false;
-        };
+    /// Returns `None` when the window does not exist, otherwise whether the
+    /// message actually changed; repeated updates with identical text should
+    /// not force a snapshot rebuild and repaint.
+    fn update_window(&mut self, window_id: u32, new_message: String) -> Option<bool> {
+        let countdown = self.countdowns.get_mut(&window_id)?;
+        if countdown.message == new_message {
+            return Some(false);
+        }
         countdown.message = new_message;
-        true
+        Some(true)
+    }
+
+    /// Earliest instant the periodic tick has work to do: the next instant a
+    /// countdown or elapsed timer changes its displayed second, or the soonest
+    /// highlight/QR expiry, whichever comes first. `None` while idle.
+    fn next_deadline(&self) -> Option<Instant> {
+        let text_changes = self.countdowns.values().map(|entry| match &entry.kind {
+            CountdownEntryKind::Countdown {
+                end_time,
+                remaining,
+            } => {
+                // `remaining` drops to the next value (and the entry expires
+                // at zero) when the time left crosses the next whole second.
+                let step = Duration::from_secs(remaining.saturating_sub(1));
+                end_time.checked_sub(step).unwrap_or(*end_time)
+            }
+            CountdownEntryKind::Elapsed {
+                start_time,
+                elapsed,
+            } => {
+                // `elapsed` advances once the running time passes the next
+                // whole second.
+                *start_time + Duration::from_secs(elapsed + 1)
+            }
+        });
+        let expiries = self
+            .rectangles
+            .values()
+            .map(|entry| entry.expires_at)
+            .chain(self.qrcodes.values().map(|entry| entry.expires_at));
+        text_changes.chain(expiries).min()
     }
 
     fn is_break_active(&mut self, now: Instant) -> bool {
@@ -508,30 +530,65 @@ impl OverlayState {
 
 fn run_actor(receiver: Receiver<ActorMessage>, ui_bridge: UiBridge) {
     let mut state = OverlayState::default();
-    let mut next_tick = Instant::now() + TICK_INTERVAL;
 
     loop {
-        let now = Instant::now();
-        let timeout = next_tick.saturating_duration_since(now);
-        match receiver.recv_timeout(timeout) {
-            Ok(ActorMessage::Execute { command, reply }) => {
-                let (response, changed) = state.execute(command, Instant::now());
-                if changed {
-                    ui_bridge.replace_snapshot(state.snapshot());
+        // Sleep until the earliest deadline instead of a fixed cadence: the
+        // next countdown/elapsed text change or overlay expiry, whichever
+        // comes first. With nothing on screen, block until the next command.
+        let message = match state.next_deadline() {
+            Some(deadline) => {
+                let timeout = deadline.saturating_duration_since(Instant::now());
+                match receiver.recv_timeout(timeout) {
+                    Ok(message) => Some(message),
+                    Err(RecvTimeoutError::Timeout) => None,
+                    Err(RecvTimeoutError::Disconnected) => break,
                 }
-                let _ = reply.send(response);
             }
-            Ok(ActorMessage::Shutdown) => break,
-            Err(RecvTimeoutError::Timeout) => {}
-            Err(RecvTimeoutError::Disconnected) => break,
-        }
+            None => match receiver.recv() {
+                Ok(message) => Some(message),
+                Err(_) => break,
+            },
+        };
 
+        let mut dirty = false;
+        let mut shutdown_requested = false;
+        // One timestamp per wakeup: every command drained in this batch and
+        // the tick check below share it instead of re-querying the clock.
         let now = Instant::now();
-        if now >= next_tick {
-            if state.tick(now) {
-                ui_bridge.replace_snapshot(state.snapshot());
+        // Drain everything already queued before ticking or publishing, so a
+        // burst of commands is folded into one snapshot rebuild.
+        let mut message = message;
+        while let Some(current) = message {
+            match current {
+                ActorMessage::Execute { command, reply } => {
+                    let (response, changed) = state.execute(command, now);
+                    dirty |= changed;
+                    let _ = reply.send(response);
+                }
+                ActorMessage::Shutdown => {
+                    shutdown_requested = true;
+                    break;
+                }
             }
-            next_tick = now + TICK_INTERVAL;
+            message = receiver.try_recv().ok();
+        }
+        if shutdown_requested {
+            break;
+        }
+
+        // Tick once a deadline has passed — a countdown/elapsed text change
+        // or an expiry. Commands drained above may have moved it.
+        if state
+            .next_deadline()
+            .is_some_and(|deadline| now >= deadline)
+        {
+            dirty |= state.tick(now);
+        }
+
+        // Rebuild and publish the snapshot once per wakeup, no matter how
+        // many changes were folded into it.
+        if dirty {
+            ui_bridge.replace_snapshot(state.snapshot());
         }
     }
 }
@@ -563,22 +620,12 @@ fn duration_ceil_seconds(duration: Duration) -> u64 {
         .saturating_add(u64::from(duration.subsec_nanos() > 0))
 }
 
-fn qr_payload_text(data: &Value) -> String {
-    match data {
-        Value::String(text) => text.clone(),
-        Value::Object(_) => serde_json::to_string(data).unwrap_or_default(),
-        other => other.to_string(),
-    }
-}
-
 #[cfg(test)]
 mod tests {
     use std::time::Duration;
 
-    use serde_json::json;
-
     use super::{OverlayState, elapsed_seconds, remaining_seconds};
-    use crate::protocol::{OverlayResponse, ParsedCommand, WindowIdArg};
+    use crate::protocol::{OverlayResponse, ParsedCommand, WindowIdArg, parse_message};
 
     #[test]
     fn countdown_math_matches_python_behavior() {
@@ -595,6 +642,34 @@ mod tests {
         assert_eq!(elapsed_seconds(now, now + Duration::from_millis(1100)), 1);
     }
 
+    #[test]
+    fn next_deadline_tracks_per_entry_second_boundaries() {
+        let now = std::time::Instant::now();
+        let mut state = OverlayState::default();
+        let _ = state.execute(
+            ParsedCommand::CreateCountdown {
+                message_text: "countdown".to_string(),
+                countdown_seconds: 10.0,
+            },
+            now,
+        );
+        // The countdown text next changes one second in, not at its expiry.
+        assert_eq!(state.next_deadline(), Some(now + Duration::from_secs(1)));
+
+        let _ = state.execute(
+            ParsedCommand::CreateHighlight {
+                rect: Some([0, 0, 10, 10]),
+                timeout_seconds: 0.5,
+            },
+            now,
+        );
+        // A sooner highlight expiry wins over the text change.
+        assert_eq!(
+            state.next_deadline(),
+            Some(now + Duration::from_millis(500))
+        );
+    }
+
     #[test]
     fn close_window_prefers_countdown_then_qr_then_highlight() {
         let now = std::time::Instant::now();
@@ -675,14 +750,11 @@ mod tests {
     fn qrcode_object_data_round_trips_as_json() {
         let now = std::time::Instant::now();
         let mut state = OverlayState::default();
-        let (response, changed) = state.execute(
-            ParsedCommand::CreateQrCodeWindow {
-                data: json!({"url":"https://example.com"}),
-                duration_seconds: 5.0,
-                caption: "Scan".to_string(),
-            },
-            now,
-        );
+        let command = parse_message(
+            br#"{"command":"create_qrcode_window","args":{"data":{"url":"https://example.com"},"duration":5,"caption":"Scan"}}"#,
+        )
+        .unwrap();
+        let (response, changed) = state.execute(command, now);
         assert_eq!(response, OverlayResponse::success_window(1));
         assert!(changed);
         assert_eq!(state.qrcodes.len(), 1);
@@ -708,11 +780,10 @@ mod tests {
             now,
         );
         let _ = state.execute(
-            ParsedCommand::CreateQrCodeWindow {
-                data: json!("https://example.com"),
-                duration_seconds: 10.0,
-                caption: "qr".to_string(),
-            },
+            parse_message(
+                br#"{"command":"create_qrcode_window","args":{"data":"https://example.com","duration":10,"caption":"qr"}}"#,
+            )
+            .unwrap(),
             now,
         );
 
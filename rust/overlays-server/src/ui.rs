@@ -1,9 +1,8 @@
 #[cfg(not(windows))]
 compile_error!("The UI module is Windows-only.");
 
-use std::ffi::OsStr;
+use std::collections::HashMap;
 use std::mem::MaybeUninit;
-use std::os::windows::ffi::OsStrExt;
 use std::sync::{Arc, Mutex, mpsc};
 use std::thread::{self, JoinHandle};
 
@@ -11,32 +10,46 @@ use windows::Win32::Foundation::{
     COLORREF, ERROR_CLASS_ALREADY_EXISTS, HINSTANCE, HWND, LPARAM, LRESULT, RECT, WPARAM,
 };
 use windows::Win32::Graphics::Gdi::{
-    ANSI_CHARSET, BeginPaint, CreateFontIndirectW, CreatePen, CreateSolidBrush,
-    DEVICE_DEFAULT_FONT, DeleteObject, DrawTextW, EndPaint, FW_NORMAL, FillRect, GetStockObject,
+    ANSI_CHARSET, BI_RGB, BITMAPINFO, BITMAPINFOHEADER, BeginPaint, BitBlt,
+    CreateCompatibleBitmap, CreateCompatibleDC, CreateFontIndirectW, DC_BRUSH,
+    DEVICE_DEFAULT_FONT, DIB_RGB_COLORS, DT_CENTER, DT_SINGLELINE, DT_VCENTER, DeleteDC,
+    DeleteObject, DrawTextW, EndPaint, FW_NORMAL, FillRect, GetStockObject,
     GetTextExtentPoint32W, HBRUSH, HDC, HFONT, HGDIOBJ, InvalidateRect, LOGFONTW, PAINTSTRUCT,
-    PS_SOLID, Rectangle, SelectObject, SetBkMode, SetTextColor, TRANSPARENT, TextOutW,
-    UpdateWindow,
+    COLORONCOLOR, RGBQUAD, SRCCOPY, SelectObject, SetBkMode, SetDCBrushColor, SetStretchBltMode,
+    SetTextColor, StretchDIBits, TRANSPARENT, TextOutW, UpdateWindow,
 };
 use windows::Win32::UI::WindowsAndMessaging::{
     CS_HREDRAW, CS_VREDRAW, CreateWindowExW, DefWindowProcW, DestroyWindow, DispatchMessageW,
     GWLP_USERDATA, GetClientRect, GetMessageW, GetSystemMetrics, GetWindowLongPtrW, IDC_ARROW,
-    LoadCursorW, MSG, PostMessageW, PostQuitMessage, RegisterClassW, SM_CXSCREEN, SM_CYSCREEN,
-    SW_SHOW, SetLayeredWindowAttributes, SetWindowLongPtrW, ShowWindow, TranslateMessage,
-    WINDOW_EX_STYLE, WINDOW_STYLE, WM_APP, WM_CLOSE, WM_DESTROY, WM_KEYDOWN, WM_PAINT, WNDCLASSW,
-    WS_EX_LAYERED, WS_EX_TOOLWINDOW, WS_EX_TOPMOST, WS_EX_TRANSPARENT, WS_POPUP,
+    IsWindowVisible, LoadCursorW, MSG, PostMessageW, PostQuitMessage, RegisterClassW, SM_CXSCREEN,
+    SM_CYSCREEN, SW_SHOW, SetLayeredWindowAttributes, SetWindowLongPtrW, ShowWindow,
+    TranslateMessage, WINDOW_EX_STYLE, WINDOW_STYLE, WM_APP, WM_CLOSE, WM_DESTROY, WM_KEYDOWN,
+    WM_PAINT, WM_SHOWWINDOW, WM_SIZE, WNDCLASSW, WS_EX_LAYERED, WS_EX_TOOLWINDOW, WS_EX_TOPMOST,
+    WS_EX_TRANSPARENT, WS_POPUP,
 };
 use windows::core::PCWSTR;
 
 use crate::render::{
-    TextSize, countdown_box_rect, countdown_lines, get_countdown_position, get_qrcode_position,
+    TextSize, countdown_box_rect, countdown_tail, get_countdown_position, get_qrcode_position,
     qr_top_start, qrcode_background_rect, qrcode_caption_rect,
 };
 use crate::state::{CountdownSnapshot, HighlightSnapshot, OverlaySnapshot, QrCodeSnapshot};
+use crate::wide::to_wide;
 
 const WINDOW_CLASS_NAME: &str = "TransparentOverlayWindow";
+/// Per-font cap on cached text measurements; the cache is dropped wholesale
+/// when it fills, which is plenty for the handful of strings painted here.
+const TEXT_CACHE_CAP: usize = 1024;
 const WINDOW_TITLE: &str = "Overlay";
 const WM_APP_SNAPSHOT: u32 = WM_APP + 1;
 
+/// Color-keyed out by SetLayeredWindowAttributes, so this is "nothing".
+const TRANSPARENT_KEY: COLORREF = rgb(255, 0, 255);
+const COUNTDOWN_TEXT_COLOR: COLORREF = rgb(0, 0, 128);
+const COUNTDOWN_BOX_COLOR: COLORREF = rgb(200, 220, 255);
+const QR_BACKGROUND_COLOR: COLORREF = rgb(255, 255, 255);
+const CAPTION_TEXT_COLOR: COLORREF = rgb(0, 0, 0);
+
 #[derive(Debug, Clone)]
 pub struct UiBridge {
     hwnd_raw: isize,
@@ -160,20 +173,25 @@ unsafe fn ui_thread_main(
         }
     };
 
-    let transparent_key = rgb(255, 0, 255);
     let _ = SetWindowLongPtrW(
         hwnd,
         GWLP_USERDATA,
         Box::into_raw(Box::new(WindowState {
             shared_snapshot,
             current_snapshot: OverlaySnapshot::default(),
-            transparent_key,
+            countdown_font: create_countdown_font(),
+            text_cache: HashMap::new(),
+            client_rect: query_client_rect(hwnd),
+            qr_bitmaps: HashMap::new(),
+            countdown_rects: HashMap::new(),
+            back_buffer: None,
+            repaint_when_shown: false,
         })) as isize,
     );
 
     if let Err(err) = SetLayeredWindowAttributes(
         hwnd,
-        transparent_key,
+        TRANSPARENT_KEY,
         200,
         windows::Win32::UI::WindowsAndMessaging::LWA_COLORKEY
             | windows::Win32::UI::WindowsAndMessaging::LWA_ALPHA,
@@ -196,7 +214,53 @@ unsafe fn ui_thread_main(
 struct WindowState {
     shared_snapshot: Arc<Mutex<OverlaySnapshot>>,
     current_snapshot: OverlaySnapshot,
-    transparent_key: COLORREF,
+    countdown_font: HFONT,
+    /// Per-font cache of UTF-16 conversions and measured extents, so static
+    /// lines are converted and measured once instead of on every paint.
+    text_cache: HashMap<usize, HashMap<String, CachedLine>>,
+    /// Client rectangle, cached so WM_PAINT skips the GetClientRect round trip;
+    /// refreshed on WM_SIZE.
+    client_rect: (i32, i32, i32, i32),
+    /// Per-QR off-screen bitmaps, rendered once at first paint and blitted on
+    /// every repaint after; pruned when the QR leaves the snapshot.
+    qr_bitmaps: HashMap<u32, QrBackingBitmap>,
+    /// Box rect each countdown was last drawn at, so per-second value ticks
+    /// can invalidate just those bands instead of the whole overlay.
+    countdown_rects: HashMap<u32, (i32, i32, i32, i32)>,
+    /// Client-sized back buffer; frames are composed here and blitted to the
+    /// window in one call, recreated when the client size changes.
+    back_buffer: Option<BackBuffer>,
+    /// Set when a snapshot arrived while the window was hidden; the deferred
+    /// repaint is issued once on WM_SHOWWINDOW instead of per tick.
+    repaint_when_shown: bool,
+}
+
+/// A text line ready to draw: its UTF-16 units plus the measured extent.
+struct CachedLine {
+    wide: Vec<u16>,
+    size: TextSize,
+}
+
+struct BackBuffer {
+    mem_dc: HDC,
+    bitmap: HGDIOBJ,
+    previous_bitmap: HGDIOBJ,
+    width: i32,
+    height: i32,
+}
+
+enum SnapshotUpdate {
+    Unchanged,
+    /// Only countdown/elapsed second values moved; layout is identical.
+    CountdownValues,
+    Full,
+}
+
+struct QrBackingBitmap {
+    mem_dc: HDC,
+    bitmap: HGDIOBJ,
+    previous_bitmap: HGDIOBJ,
+    qr_size: i32,
 }
 
 unsafe extern "system" fn window_proc(
@@ -208,10 +272,42 @@ unsafe extern "system" fn window_proc(
     match message {
         WM_APP_SNAPSHOT => {
             if let Some(state) = window_state_mut(hwnd) {
-                if let Ok(snapshot) = state.shared_snapshot.lock() {
-                    state.current_snapshot = snapshot.clone();
+                let update = match state.shared_snapshot.lock() {
+                    Ok(snapshot) => {
+                        if *snapshot == state.current_snapshot {
+                            SnapshotUpdate::Unchanged
+                        } else {
+                            let values_only = only_countdown_values_changed(
+                                &state.current_snapshot,
+                                &snapshot,
+                            );
+                            state.current_snapshot = snapshot.clone();
+                            if values_only {
+                                SnapshotUpdate::CountdownValues
+                            } else {
+                                SnapshotUpdate::Full
+                            }
+                        }
+                    }
+                    Err(_) => SnapshotUpdate::Unchanged,
+                };
+                // State bookkeeping above still runs while hidden; only the
+                // invalidation is skipped, then replayed on WM_SHOWWINDOW.
+                let visible = IsWindowVisible(hwnd).as_bool();
+                match update {
+                    SnapshotUpdate::Unchanged => {}
+                    SnapshotUpdate::CountdownValues if visible => {
+                        invalidate_countdown_bands(hwnd, state)
+                    }
+                    SnapshotUpdate::Full if visible => {
+                        prune_qr_bitmaps(state);
+                        prune_countdown_rects(state);
+                        let _ = InvalidateRect(Some(hwnd), None, true);
+                    }
+                    SnapshotUpdate::CountdownValues | SnapshotUpdate::Full => {
+                        state.repaint_when_shown = true;
+                    }
                 }
-                let _ = InvalidateRect(Some(hwnd), None, true);
             }
             LRESULT(0)
         }
@@ -219,6 +315,23 @@ unsafe extern "system" fn window_proc(
             on_paint(hwnd);
             LRESULT(0)
         }
+        WM_SIZE => {
+            if let Some(state) = window_state_mut(hwnd) {
+                state.client_rect = query_client_rect(hwnd);
+            }
+            LRESULT(0)
+        }
+        WM_SHOWWINDOW if wparam.0 != 0 => {
+            if let Some(state) = window_state_mut(hwnd) {
+                if state.repaint_when_shown {
+                    state.repaint_when_shown = false;
+                    prune_qr_bitmaps(state);
+                    prune_countdown_rects(state);
+                    let _ = InvalidateRect(Some(hwnd), None, true);
+                }
+            }
+            DefWindowProcW(hwnd, message, wparam, lparam)
+        }
         WM_KEYDOWN if wparam.0 as u32 == 0x1B => {
             let _ = DestroyWindow(hwnd);
             LRESULT(0)
@@ -229,6 +342,13 @@ unsafe extern "system" fn window_proc(
         }
         WM_DESTROY => {
             if let Some(state) = window_state_ptr(hwnd) {
+                let _ = DeleteObject(HGDIOBJ((*state).countdown_font.0));
+                for (_, backing) in (*state).qr_bitmaps.drain() {
+                    release_qr_backing(backing);
+                }
+                if let Some(buffer) = (*state).back_buffer.take() {
+                    release_back_buffer(buffer);
+                }
                 drop(Box::from_raw(state));
                 let _ = SetWindowLongPtrW(hwnd, GWLP_USERDATA, 0);
             }
@@ -246,36 +366,132 @@ unsafe fn on_paint(hwnd: HWND) {
         return;
     }
 
-    let mut rect = RECT::default();
-    let _ = GetClientRect(hwnd, &mut rect);
     if let Some(state) = window_state_mut(hwnd) {
-        draw_all(
-            hdc,
-            (rect.left, rect.top, rect.right, rect.bottom),
-            &state.current_snapshot,
-            state.transparent_key,
+        let dirty = (
+            paint.rcPaint.left,
+            paint.rcPaint.top,
+            paint.rcPaint.right,
+            paint.rcPaint.bottom,
         );
+        match back_buffer_dc(hdc, state) {
+            Some(mem_dc) => {
+                draw_all(mem_dc, state.client_rect, dirty, state);
+                let _ = BitBlt(
+                    hdc,
+                    dirty.0,
+                    dirty.1,
+                    dirty.2 - dirty.0,
+                    dirty.3 - dirty.1,
+                    Some(mem_dc),
+                    dirty.0,
+                    dirty.1,
+                    SRCCOPY,
+                );
+            }
+            // Without a back buffer, paint straight to the window like before.
+            None => draw_all(hdc, state.client_rect, dirty, state),
+        }
     }
     let _ = EndPaint(hwnd, &paint);
 }
 
+/// Returns the memory DC of a client-sized back buffer, (re)creating it when
+/// missing or stale after a resize.
+unsafe fn back_buffer_dc(hdc: HDC, state: &mut WindowState) -> Option<HDC> {
+    let (left, top, right, bottom) = state.client_rect;
+    let (width, height) = (right - left, bottom - top);
+    if width <= 0 || height <= 0 {
+        return None;
+    }
+
+    if let Some(buffer) = &state.back_buffer {
+        if buffer.width == width && buffer.height == height {
+            return Some(buffer.mem_dc);
+        }
+    }
+    if let Some(stale) = state.back_buffer.take() {
+        release_back_buffer(stale);
+    }
+
+    let mem_dc = CreateCompatibleDC(Some(hdc));
+    if mem_dc.0.is_null() {
+        return None;
+    }
+    let bitmap = CreateCompatibleBitmap(hdc, width, height);
+    if bitmap.0.is_null() {
+        let _ = DeleteDC(mem_dc);
+        return None;
+    }
+    let previous_bitmap = SelectObject(mem_dc, HGDIOBJ(bitmap.0));
+    state.back_buffer = Some(BackBuffer {
+        mem_dc,
+        bitmap: HGDIOBJ(bitmap.0),
+        previous_bitmap,
+        width,
+        height,
+    });
+    Some(mem_dc)
+}
+
+unsafe fn release_back_buffer(buffer: BackBuffer) {
+    let _ = SelectObject(buffer.mem_dc, buffer.previous_bitmap);
+    let _ = DeleteObject(buffer.bitmap);
+    let _ = DeleteDC(buffer.mem_dc);
+}
+
+unsafe fn query_client_rect(hwnd: HWND) -> (i32, i32, i32, i32) {
+    let mut rect = RECT::default();
+    let _ = GetClientRect(hwnd, &mut rect);
+    (rect.left, rect.top, rect.right, rect.bottom)
+}
+
+/// Repaints only what intersects `dirty`: the window invalidates per-overlay
+/// bands, so pixels outside the update region are still valid in the back
+/// buffer and overlays that miss it are skipped outright.
 unsafe fn draw_all(
     hdc: HDC,
     full_rect: (i32, i32, i32, i32),
-    snapshot: &OverlaySnapshot,
-    transparent_key: COLORREF,
+    dirty: (i32, i32, i32, i32),
+    state: &mut WindowState,
 ) {
-    let background = CreateSolidBrush(transparent_key);
-    let rect = rect_from_tuple(full_rect);
-    let _ = FillRect(hdc, &rect, background);
-    let _ = DeleteObject(HGDIOBJ(background.0));
+    let WindowState {
+        current_snapshot: snapshot,
+        countdown_font,
+        text_cache,
+        qr_bitmaps,
+        countdown_rects,
+        ..
+    } = state;
+
+    let Some(background) = intersect_rects(full_rect, dirty) else {
+        return;
+    };
+    fill_rect_dc_brush(hdc, background, TRANSPARENT_KEY);
 
     for rectangle in &snapshot.rectangles {
-        draw_highlight_rectangle(hdc, rectangle);
+        if intersect_rects(rectangle.coords, dirty).is_some() {
+            draw_highlight_rectangle(hdc, rectangle);
+        }
     }
 
     for (index, countdown) in snapshot.countdowns.iter().enumerate() {
-        draw_countdown(hdc, countdown, get_countdown_position(index, full_rect));
+        // The drawn box can extend past its nominal slot, so the skip test
+        // uses the rect it actually occupied last frame when one is cached.
+        let position = get_countdown_position(index, full_rect);
+        let occupied = countdown_rects.get(&countdown.id).copied();
+        if let Some(occupied) = occupied {
+            if intersect_rects(occupied, dirty).is_none() {
+                continue;
+            }
+        }
+        draw_countdown(
+            hdc,
+            countdown,
+            position,
+            *countdown_font,
+            text_cache,
+            countdown_rects,
+        );
     }
 
     let box_gap = 10;
@@ -286,127 +502,335 @@ unsafe fn draw_all(
             hdc,
             qrcode,
             get_qrcode_position(index, total, box_gap, top_start, full_rect),
+            dirty,
+            text_cache,
+            qr_bitmaps,
         );
     }
 }
 
+fn intersect_rects(
+    a: (i32, i32, i32, i32),
+    b: (i32, i32, i32, i32),
+) -> Option<(i32, i32, i32, i32)> {
+    let left = a.0.max(b.0);
+    let top = a.1.max(b.1);
+    let right = a.2.min(b.2);
+    let bottom = a.3.min(b.3);
+    if left < right && top < bottom {
+        Some((left, top, right, bottom))
+    } else {
+        None
+    }
+}
+
+/// Solid-fills through the stock DC brush: SetDCBrushColor picks the color
+/// without allocating (or caching) any per-color GDI object.
+unsafe fn fill_rect_dc_brush(hdc: HDC, rect: (i32, i32, i32, i32), color: COLORREF) {
+    let dc_brush = HBRUSH(GetStockObject(DC_BRUSH).0);
+    let _ = SetDCBrushColor(hdc, color);
+    let _ = FillRect(hdc, &rect_from_tuple(rect), dc_brush);
+}
+
 unsafe fn draw_highlight_rectangle(hdc: HDC, rectangle: &HighlightSnapshot) {
-    let (left, top, right, bottom) = rectangle.coords;
     let (red, green, blue) = rectangle.color;
-    let color = rgb(red, green, blue);
-    let pen = CreatePen(PS_SOLID, 2, color);
-    let brush = CreateSolidBrush(color);
-    let old_pen = SelectObject(hdc, HGDIOBJ(pen.0));
-    let old_brush = SelectObject(hdc, HGDIOBJ(brush.0));
-    let _ = Rectangle(hdc, left, top, right, bottom);
-    let _ = SelectObject(hdc, old_pen);
-    let _ = SelectObject(hdc, old_brush);
-    let _ = DeleteObject(HGDIOBJ(pen.0));
-    let _ = DeleteObject(HGDIOBJ(brush.0));
-}
-
-unsafe fn draw_countdown(hdc: HDC, countdown: &CountdownSnapshot, position: (i32, i32, i32, i32)) {
-    let lines = countdown_lines(countdown);
-    let font = create_countdown_font();
+    // The old pen and brush shared one color, so Rectangle was just a fill.
+    fill_rect_dc_brush(hdc, rectangle.coords, rgb(red, green, blue));
+}
+
+unsafe fn draw_countdown(
+    hdc: HDC,
+    countdown: &CountdownSnapshot,
+    position: (i32, i32, i32, i32),
+    font: HFONT,
+    text_cache: &mut HashMap<usize, HashMap<String, CachedLine>>,
+    countdown_rects: &mut HashMap<u32, (i32, i32, i32, i32)>,
+) {
+    let tail = countdown_tail(countdown);
+    let lines = [countdown.message.as_str(), tail.as_str()];
     let old_font = SelectObject(hdc, HGDIOBJ(font.0));
-    let _ = SetTextColor(hdc, rgb(0, 0, 128));
+    let _ = SetTextColor(hdc, COUNTDOWN_TEXT_COLOR);
     let _ = SetBkMode(hdc, TRANSPARENT);
 
-    let line_sizes: Vec<_> = lines.iter().map(|line| measure_text(hdc, line)).collect();
+    let line_sizes: Vec<_> = lines
+        .iter()
+        .map(|line| cached_line(hdc, font, line, text_cache).size)
+        .collect();
     let final_rect = countdown_box_rect(position, &line_sizes, (8, 8));
-    let background = CreateSolidBrush(rgb(200, 220, 255));
-    let _ = FillRect(hdc, &rect_from_tuple(final_rect), background);
-    let _ = DeleteObject(HGDIOBJ(background.0));
+    countdown_rects.insert(countdown.id, final_rect);
+    fill_rect_dc_brush(hdc, final_rect, COUNTDOWN_BOX_COLOR);
 
     let mut y = final_rect.1 + 8;
     for (line, size) in lines.iter().zip(line_sizes.iter()) {
         let x = final_rect.0 + (((final_rect.2 - final_rect.0) - size.width) / 2);
-        draw_text(hdc, x, y, line);
+        // Second lookup is a guaranteed cache hit; it trades one hash probe
+        // for holding no borrow across the size math above.
+        let wide = &cached_line(hdc, font, line, text_cache).wide;
+        draw_text(hdc, x, y, wide);
         y += size.height;
     }
 
     let _ = SelectObject(hdc, old_font);
-    let _ = DeleteObject(HGDIOBJ(font.0));
 }
 
-unsafe fn draw_qrcode(hdc: HDC, qrcode: &QrCodeSnapshot, position: (i32, i32, i32, i32)) {
+unsafe fn draw_qrcode(
+    hdc: HDC,
+    qrcode: &QrCodeSnapshot,
+    position: (i32, i32, i32, i32),
+    dirty: (i32, i32, i32, i32),
+    text_cache: &mut HashMap<usize, HashMap<String, CachedLine>>,
+    qr_bitmaps: &mut HashMap<u32, QrBackingBitmap>,
+) {
     let stock_font = HFONT(GetStockObject(DEVICE_DEFAULT_FONT).0);
     let old_font = SelectObject(hdc, HGDIOBJ(stock_font.0));
 
-    let caption_size = if qrcode.caption.is_empty() {
+    // DrawTextW wants a mutable buffer, so the caption keeps its own copy
+    // instead of borrowing the cached conversion.
+    let mut wide_caption = to_wide_chars(&qrcode.caption);
+    let caption_size = if wide_caption.is_empty() {
         None
     } else {
-        Some(measure_text(hdc, &qrcode.caption))
+        Some(cached_line(hdc, stock_font, &qrcode.caption, text_cache).size)
     };
     let background_rect = qrcode_background_rect(position, caption_size);
-    let background = CreateSolidBrush(rgb(255, 255, 255));
-    let _ = FillRect(hdc, &rect_from_tuple(background_rect), background);
-    let _ = DeleteObject(HGDIOBJ(background.0));
-
-    let pen = CreatePen(PS_SOLID, 0, rgb(0, 0, 0));
-    let brush = CreateSolidBrush(rgb(0, 0, 0));
-    let old_pen = SelectObject(hdc, HGDIOBJ(pen.0));
-    let old_brush = SelectObject(hdc, HGDIOBJ(brush.0));
+    // The caption can widen the box past its slot, so the skip test waits
+    // until the full background rect is known.
+    if intersect_rects(background_rect, dirty).is_none() {
+        let _ = SelectObject(hdc, old_font);
+        return;
+    }
+    fill_rect_dc_brush(hdc, background_rect, QR_BACKGROUND_COLOR);
 
     let (left, top, _, _) = position;
-    for (row_index, row) in qrcode.matrix.iter().enumerate() {
-        for (column_index, dark) in row.iter().enumerate() {
-            if !dark {
-                continue;
-            }
-            let x0 = left + qrcode.padding + (column_index as i32 * qrcode.pix_per_mod);
-            let y0 = top + qrcode.padding + (row_index as i32 * qrcode.pix_per_mod);
-            let x1 = x0 + qrcode.pix_per_mod;
-            let y1 = y0 + qrcode.pix_per_mod;
-            let _ = Rectangle(hdc, x0, y0, x1, y1);
+    let (x, y) = (left + qrcode.padding, top + qrcode.padding);
+    match qr_backing(hdc, qrcode, qr_bitmaps) {
+        Some(backing) => {
+            let _ = BitBlt(
+                hdc,
+                x,
+                y,
+                backing.qr_size,
+                backing.qr_size,
+                Some(backing.mem_dc),
+                0,
+                0,
+                SRCCOPY,
+            );
         }
+        // If the off-screen bitmap could not be created, stretch the DIB
+        // directly like before.
+        None => blit_qr_modules(hdc, qrcode, x, y),
     }
 
-    let _ = SelectObject(hdc, old_pen);
-    let _ = SelectObject(hdc, old_brush);
-    let _ = DeleteObject(HGDIOBJ(pen.0));
-    let _ = DeleteObject(HGDIOBJ(brush.0));
-
     if let Some(caption_size) = caption_size {
         let mut caption_rect =
             rect_from_tuple(qrcode_caption_rect(position, caption_size, background_rect));
-        let _ = SetTextColor(hdc, rgb(0, 0, 0));
+        let _ = SetTextColor(hdc, CAPTION_TEXT_COLOR);
         let _ = SetBkMode(hdc, TRANSPARENT);
-        let mut wide = to_wide(&qrcode.caption);
-        let text_len = wide.len().saturating_sub(1);
         let _ = DrawTextW(
             hdc,
-            &mut wide[..text_len],
+            &mut wide_caption,
             &mut caption_rect,
-            windows::Win32::Graphics::Gdi::DT_CENTER
-                | windows::Win32::Graphics::Gdi::DT_SINGLELINE
-                | windows::Win32::Graphics::Gdi::DT_VCENTER,
+            DT_CENTER | DT_SINGLELINE | DT_VCENTER,
         );
     }
 
     let _ = SelectObject(hdc, old_font);
 }
 
-unsafe fn create_countdown_font() -> HFONT {
-    let mut face_name = [0_u16; 32];
-    let wide_name = to_wide("Segoe UI");
-    for (index, value) in wide_name.iter().copied().enumerate().take(face_name.len()) {
-        face_name[index] = value;
+/// Returns the cached off-screen copy of this QR code, rendering it once on
+/// first use.
+unsafe fn qr_backing<'a>(
+    hdc: HDC,
+    qrcode: &QrCodeSnapshot,
+    qr_bitmaps: &'a mut HashMap<u32, QrBackingBitmap>,
+) -> Option<&'a QrBackingBitmap> {
+    if !qr_bitmaps.contains_key(&qrcode.id) {
+        let mem_dc = CreateCompatibleDC(Some(hdc));
+        if mem_dc.0.is_null() {
+            return None;
+        }
+        let bitmap = CreateCompatibleBitmap(hdc, qrcode.qr_size, qrcode.qr_size);
+        if bitmap.0.is_null() {
+            let _ = DeleteDC(mem_dc);
+            return None;
+        }
+        let previous_bitmap = SelectObject(mem_dc, HGDIOBJ(bitmap.0));
+        blit_qr_modules(mem_dc, qrcode, 0, 0);
+        qr_bitmaps.insert(
+            qrcode.id,
+            QrBackingBitmap {
+                mem_dc,
+                bitmap: HGDIOBJ(bitmap.0),
+                previous_bitmap,
+                qr_size: qrcode.qr_size,
+            },
+        );
     }
+    qr_bitmaps.get(&qrcode.id)
+}
+
+/// True when the snapshots differ only in countdown/elapsed second values,
+/// so every box keeps its position and only its text band needs repainting.
+fn only_countdown_values_changed(old: &OverlaySnapshot, new: &OverlaySnapshot) -> bool {
+    old.rectangles == new.rectangles
+        && old.qrcodes == new.qrcodes
+        && old.countdowns.len() == new.countdowns.len()
+        && old
+            .countdowns
+            .iter()
+            .zip(new.countdowns.iter())
+            .all(|(before, after)| {
+                before.id == after.id
+                    && before.message == after.message
+                    && before.order == after.order
+            })
+}
+
+/// Invalidates one full-width band per countdown box. The band spans the
+/// window horizontally because the new tail text may be wider or narrower
+/// than the last one; draw_all's background fill clears stale pixels inside
+/// the clip region, so no erase pass is needed.
+unsafe fn invalidate_countdown_bands(hwnd: HWND, state: &mut WindowState) {
+    let (left, _, right, _) = state.client_rect;
+    for countdown in &state.current_snapshot.countdowns {
+        let Some((_, top, _, bottom)) = state.countdown_rects.get(&countdown.id).copied() else {
+            // Never drawn yet; fall back to a full repaint.
+            let _ = InvalidateRect(Some(hwnd), None, true);
+            return;
+        };
+        let band = RECT {
+            left,
+            top,
+            right,
+            bottom,
+        };
+        let _ = InvalidateRect(Some(hwnd), Some(&band), false);
+    }
+}
 
-    let mut font = LOGFONTW::default();
-    font.lfHeight = -20;
-    font.lfWeight = FW_NORMAL.0 as i32;
-    font.lfCharSet = ANSI_CHARSET;
-    font.lfFaceName = face_name;
+fn prune_countdown_rects(state: &mut WindowState) {
+    let live: Vec<u32> = state
+        .current_snapshot
+        .countdowns
+        .iter()
+        .map(|countdown| countdown.id)
+        .collect();
+    state.countdown_rects.retain(|id, _| live.contains(id));
+}
+
+unsafe fn release_qr_backing(backing: QrBackingBitmap) {
+    let _ = SelectObject(backing.mem_dc, backing.previous_bitmap);
+    let _ = DeleteObject(backing.bitmap);
+    let _ = DeleteDC(backing.mem_dc);
+}
+
+unsafe fn prune_qr_bitmaps(state: &mut WindowState) {
+    let stale: Vec<u32> = state
+        .qr_bitmaps
+        .keys()
+        .filter(|id| {
+            !state
+                .current_snapshot
+                .qrcodes
+                .iter()
+                .any(|qrcode| qrcode.id == **id)
+        })
+        .copied()
+        .collect();
+    for id in stale {
+        if let Some(backing) = state.qr_bitmaps.remove(&id) {
+            release_qr_backing(backing);
+        }
+    }
+}
+
+/// BITMAPINFO with the two-entry color table a 1-bpp DIB needs.
+#[repr(C)]
+struct QrBitmapInfo {
+    header: BITMAPINFOHEADER,
+    colors: [RGBQUAD; 2],
+}
+
+/// Blits the precomputed 1-bpp module bitmap in a single call, stretching each
+/// module to its on-screen pixel size.
+unsafe fn blit_qr_modules(hdc: HDC, qrcode: &QrCodeSnapshot, x: i32, y: i32) {
+    let bitmap_info = QrBitmapInfo {
+        header: BITMAPINFOHEADER {
+            biSize: std::mem::size_of::<BITMAPINFOHEADER>() as u32,
+            biWidth: qrcode.modules,
+            biHeight: -qrcode.modules,
+            biPlanes: 1,
+            biBitCount: 1,
+            biCompression: BI_RGB.0,
+            ..Default::default()
+        },
+        colors: [
+            RGBQUAD {
+                rgbBlue: 255,
+                rgbGreen: 255,
+                rgbRed: 255,
+                rgbReserved: 0,
+            },
+            RGBQUAD::default(),
+        ],
+    };
+    // Nearest-neighbor scaling: module edges must stay crisp for scanners.
+    let _ = SetStretchBltMode(hdc, COLORONCOLOR);
+    let _ = StretchDIBits(
+        hdc,
+        x,
+        y,
+        qrcode.qr_size,
+        qrcode.qr_size,
+        0,
+        0,
+        qrcode.modules,
+        qrcode.modules,
+        Some(qrcode.dib_bits.as_ptr().cast()),
+        (&raw const bitmap_info).cast::<BITMAPINFO>(),
+        DIB_RGB_COLORS,
+        SRCCOPY,
+    );
+}
+
+unsafe fn create_countdown_font() -> HFONT {
+    let mut font = LOGFONTW {
+        lfHeight: -20,
+        lfWeight: FW_NORMAL.0 as i32,
+        lfCharSet: ANSI_CHARSET,
+        ..Default::default()
+    };
+    for (target, value) in font.lfFaceName.iter_mut().zip("Segoe UI".encode_utf16()) {
+        *target = value;
+    }
     HFONT(CreateFontIndirectW(&font).0)
 }
 
-unsafe fn measure_text(hdc: HDC, text: &str) -> TextSize {
-    let wide = to_wide(text);
+/// Memoizes the UTF-16 conversion and GetTextExtentPoint32W per (font, text).
+/// Countdown messages and QR captions are static across paints, so only the
+/// per-second countdown tail ever misses after the first frame.
+unsafe fn cached_line<'a>(
+    hdc: HDC,
+    font: HFONT,
+    text: &str,
+    text_cache: &'a mut HashMap<usize, HashMap<String, CachedLine>>,
+) -> &'a CachedLine {
+    let by_font = text_cache.entry(font.0 as usize).or_default();
+    if !by_font.contains_key(text) {
+        let wide = to_wide_chars(text);
+        let size = measure_text(hdc, &wide);
+        if by_font.len() >= TEXT_CACHE_CAP {
+            by_font.clear();
+        }
+        by_font.insert(text.to_string(), CachedLine { wide, size });
+    }
+    &by_font[text]
+}
+
+unsafe fn measure_text(hdc: HDC, text: &[u16]) -> TextSize {
     let mut size = MaybeUninit::zeroed();
-    let text_len = wide.len().saturating_sub(1);
-    let _ = GetTextExtentPoint32W(hdc, &wide[..text_len], size.as_mut_ptr());
+    let _ = GetTextExtentPoint32W(hdc, text, size.as_mut_ptr());
     let size = size.assume_init();
     TextSize {
         width: size.cx,
@@ -414,10 +838,8 @@ unsafe fn measure_text(hdc: HDC, text: &str) -> TextSize {
     }
 }
 
-unsafe fn draw_text(hdc: HDC, x: i32, y: i32, text: &str) {
-    let wide = to_wide(text);
-    let text_len = wide.len().saturating_sub(1);
-    let _ = TextOutW(hdc, x, y, &wide[..text_len]);
+unsafe fn draw_text(hdc: HDC, x: i32, y: i32, text: &[u16]) {
+    let _ = TextOutW(hdc, x, y, text);
 }
 
 unsafe fn window_state_mut(hwnd: HWND) -> Option<&'static mut WindowState> {
@@ -443,13 +865,11 @@ fn rect_from_tuple((left, top, right, bottom): (i32, i32, i32, i32)) -> RECT {
     }
 }
 
-fn rgb(red: u8, green: u8, blue: u8) -> COLORREF {
+const fn rgb(red: u8, green: u8, blue: u8) -> COLORREF {
     COLORREF((red as u32) | ((green as u32) << 8) | ((blue as u32) << 16))
 }
 
-fn to_wide(value: &str) -> Vec<u16> {
-    OsStr::new(value)
-        .encode_wide()
-        .chain(std::iter::once(0))
-        .collect()
+/// UTF-16 units without a trailing nul, for the slice-based GDI text calls.
+fn to_wide_chars(value: &str) -> Vec<u16> {
+    value.encode_utf16().collect()
 }
@@ -0,0 +1,10 @@
+use std::ffi::OsStr;
+use std::os::windows::ffi::OsStrExt;
+
+/// Nul-terminated UTF-16 buffer for the PCWSTR-taking Win32 APIs.
+pub(crate) fn to_wide(value: &str) -> Vec<u16> {
+    OsStr::new(value)
+        .encode_wide()
+        .chain(std::iter::once(0))
+        .collect()
+}
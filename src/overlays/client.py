@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 import time
 import os
 import sys
@@ -59,6 +60,7 @@ class OverlayClient:
         self.timeout = timeout
         self.pipe_handle = None
         self.server_available = False
+        self._io_lock = threading.Lock()
         self._connect()
 
     def _connect(self) -> None:
@@ -133,13 +135,16 @@ class OverlayClient:
         # Prepare command data
         command_data = {"command": command, "args": args or {}}
 
-        try:
-            # Send command
-            message = json.dumps(command_data).encode("utf-8")
-            win32file.WriteFile(self.pipe_handle, message)
+        # Encode outside the lock so only the pipe transaction itself is
+        # serialized when the shared client is used from several threads.
+        message = json.dumps(command_data).encode("utf-8")
 
-            # Read response
-            result, data = win32file.ReadFile(self.pipe_handle, 65536)
+        try:
+            # Send command and read its response as one atomic exchange;
+            # interleaved writers would otherwise receive each other's replies.
+            with self._io_lock:
+                win32file.WriteFile(self.pipe_handle, message)
+                result, data = win32file.ReadFile(self.pipe_handle, 65536)
             if result == 0 and data:
                 return json.loads(data.decode("utf-8"))
 
@@ -150,13 +155,11 @@ class OverlayClient:
             if e.winerror in [109, 232]:  # Broken pipe or no data
                 self._handle_connection_lost(command)
                 return {"status": "ignored", "reason": "connection_lost"}
-            msg = f"Error sending command '{command}': {e}"
-            logger.debug(msg)
+            logger.debug("Error sending command '%s': %s", command, e)
             return {"status": "ignored", "reason": "communication_error"}
 
         except json.JSONDecodeError as e:
-            msg = f"Invalid response from server for command '{command}': {e}"
-            logger.debug(msg)
+            logger.debug("Invalid response from server for command '%s': %s", command, e)
             return {"status": "ignored", "reason": "invalid_response"}
 
         else:
@@ -237,7 +240,7 @@ class OverlayClient:
 
     def create_qrcode_window(
         self, data: str | dict, duration: int = 5, caption: str | None = None
-    ) -> int:
+    ) -> int | None:
         """
         Create a timed QR Code window.
 
@@ -345,8 +348,7 @@ class OverlayClient:
                 win32file.CloseHandle(self.pipe_handle)
             except (pywintypes.error, OSError) as e:
                 # Log the specific error but continue cleanup
-                msg = f"Error closing pipe handle: {e}"
-                logger.debug(msg)
+                logger.debug("Error closing pipe handle: %s", e)
             self.pipe_handle = None
 
         self.server_available = False
@@ -440,13 +442,20 @@ class RemoteElapsedTimeWindow:
 
 
 _overlay_client: OverlayClient | None = None
+_overlay_client_lock = threading.Lock()
 
 
 def get_overlay_client(timeout: int = 5000) -> OverlayClient:
     global _overlay_client  # noqa: PLW0603
-    if _overlay_client is None or not _overlay_client.is_available():
-        _overlay_client = OverlayClient(timeout=timeout)
-    return _overlay_client
+    # Fast path without the lock; re-check under it so concurrent callers
+    # cannot each connect their own client.
+    client = _overlay_client
+    if client is not None and client.is_available():
+        return client
+    with _overlay_client_lock:
+        if _overlay_client is None or not _overlay_client.is_available():
+            _overlay_client = OverlayClient(timeout=timeout)
+        return _overlay_client
 
 
 if __name__ == "__main__":